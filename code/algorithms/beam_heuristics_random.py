@@ -1,4 +1,5 @@
 from typing import List, Tuple, Optional
+import heapq
 import random
 from collections import deque
 from classes.rail_network import RailNetwork
@@ -106,6 +107,8 @@ class BeamSearchAlgorithmV3:
         for conn in self.rail_network.connections:
             conn.used = False
         self.rail_network.routes.clear()
+        self.heuristic.reset_unused_counts()
+        unused_counts = self.heuristic.unused_counts
         
         # Verkrijg stations gesorteerd op aantal verbindingen
         stations = list(self.rail_network.stations.keys())
@@ -113,29 +116,22 @@ class BeamSearchAlgorithmV3:
         
         while routes_created < self.max_routes:
             # Probeer stations te vinden met ongebruikte verbindingen
-            stations_with_unused = [
-                station for station in stations
-                if any(not conn.used 
-                      for conn in self.rail_network.stations[station].connections.values())
-            ]
+            stations_with_unused = [station for station in stations if unused_counts[station]]
             
             if not stations_with_unused:
                 break
             
             # Prioriteer stations met meer ongebruikte verbindingen
-            stations_with_unused.sort(
-                key=lambda s: sum(1 for conn in self.rail_network.stations[s].connections.values() 
-                                if not conn.used),
-                reverse=True
-            )
+            # nlargest geeft dezelfde top 3 als sorteren, zonder de hele lijst te sorteren
+            top_stations = heapq.nlargest(3, stations_with_unused, key=unused_counts.__getitem__)
             
             # Neem willekeurig één van de top 3 stations voor variatie
-            start_station = random.choice(stations_with_unused[:min(3, len(stations_with_unused))])
+            start_station = random.choice(top_stations)
             route = self.create_route(start_station)
             
             if route and route.connections_used:
                 for conn in route.connections_used:
-                    conn.used = True
+                    self.heuristic.mark_used(conn)
                 self.rail_network.routes.append(route)
                 routes_created += 1
         
@@ -44,7 +44,8 @@ class SimplifiedBFSAlgorithm:
             )
             
             if connection:
-                next_station = connection.get_other_station(current_station)
+                station1 = connection.station1
+                next_station = connection.station2 if current_station == station1 else station1
                 new_time = total_time + connection.distance
                 new_visited = visited | {next_station}
                 new_path = path + [next_station]
@@ -90,6 +91,7 @@ class SimplifiedBFSAlgorithm:
         for conn in self.rail_network.connections:
             conn.used = False
         self.rail_network.routes.clear()
+        self.heuristic.reset_unused_counts()
         
         routes_created = 0
         all_stations = list(self.rail_network.stations.keys())
@@ -115,7 +117,7 @@ class SimplifiedBFSAlgorithm:
                 
             # Add the best route found to our solution
             for conn in best_route.connections_used:
-                conn.used = True
+                self.heuristic.mark_used(conn)
             self.rail_network.routes.append(best_route)
             routes_created += 1
             
@@ -136,10 +138,4 @@ class SimplifiedBFSAlgorithm:
             Tuple[float, List[Route]]: Quality score and routes
         """
         quality = self.create_solution()
-        best_routes = [Route() for _ in self.rail_network.routes]
-        for new_route, old_route in zip(best_routes, self.rail_network.routes):
-            new_route.stations = old_route.stations.copy()
-            new_route.total_time = old_route.total_time
-            new_route.connections_used = old_route.connections_used.copy()
-        
-        return quality, best_routes
\ No newline at end of file
+        return quality, list(self.rail_network.routes)
\ No newline at end of file
@@ -27,29 +27,30 @@ class SimplifiedBFSAlgorithm:
         Returns:
             Optional[Route]: Best route found, or None if no valid route exists
         """
-        # Queue stores: (current_station, path_so_far, total_time, connections_used)
-        queue = deque([(start_station, [], 0, set())])
+        # Queue stores: (current_station, path_so_far, total_time, connections_used, unused_count)
+        # unused_count is the number of connections in connections_used that are not used yet
+        queue = deque([(start_station, [], 0, set(), 0)])
         best_route = None
         best_unused_connections = 0
+        time_limit = self.time_limit
+        stations = self.rail_network.stations
         
         while queue:
-            current_station, path, total_time, connections_used = queue.popleft()
+            current_station, path, total_time, connections_used, unused_count = queue.popleft()
+            new_path = path + [current_station]
             
-            # Get all possible next connections from current station
-            station = self.rail_network.stations[current_station]
-            possible_connections = [
-                (dest, conn) for dest, conn in station.connections.items()
-                if total_time + conn.distance <= self.time_limit
-            ]
-            
-            # Try each possible next connection
-            for next_station, connection in possible_connections:
+            # Try each connection from the current station that fits in the time limit
+            for next_station, connection in stations[current_station].connections.items():
                 new_time = total_time + connection.distance
-                new_path = path + [current_station]
+                if new_time > time_limit:
+                    continue
+
                 new_connections = connections_used | {connection}
                 
-                # Count how many unused connections this route would use
-                unused_connections = sum(1 for conn in new_connections if not conn.used)
+                # Count how many unused connections this route would use, based on the parent route
+                unused_connections = unused_count
+                if not connection.used and connection not in connections_used:
+                    unused_connections += 1
                 
                 # Update best route if this one uses more unused connections
                 if unused_connections > best_unused_connections:
@@ -60,7 +61,7 @@ class SimplifiedBFSAlgorithm:
                     best_route.connections_used = new_connections
                 
                 # Add this state to queue for further exploration
-                queue.append((next_station, new_path, new_time, new_connections))
+                queue.append((next_station, new_path, new_time, new_connections, unused_connections))
         
         return best_route
 
@@ -123,10 +124,4 @@ class SimplifiedBFSAlgorithm:
             Tuple[float, List[Route]]: Quality score and routes
         """
         quality = self.create_solution()
-        best_routes = [Route() for _ in self.rail_network.routes]
-        for new_route, old_route in zip(best_routes, self.rail_network.routes):
-            new_route.stations = old_route.stations.copy()
-            new_route.total_time = old_route.total_time
-            new_route.connections_used = old_route.connections_used.copy()
-        
-        return quality, best_routes
\ No newline at end of file
+        return quality, list(self.rail_network.routes)
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 # Bron: https://www.datacamp.com/tutorial/dijkstra-algorithm-in-python
 
-from heapq import heapify, heappop, heappush
+from heapq import heappop, heappush
 from typing import List, Tuple, Set
 from classes.rail_network import RailNetwork
 from classes.route import Route
@@ -37,24 +37,30 @@ class DijkstraAlgorithm:
         Returns:
             Route: De gecreërde route
         """        
+        # we werken met de integer ids van de stations, zodat afstanden en voorgangers in lijsten passen
+        self.rail_network.ensure_station_index()
+        source_id = self.rail_network.station_ids[source]
+        adjacency = self.rail_network.adjacency
+
         # we zetten de afstanden naar alle stations op oneindig
-        distances = {station: float('inf') for station in self.rail_network.stations}
+        distances = [float('inf')] * len(adjacency)
         
         # we stellen de afstand naar source gelijk aan 0
-        distances[source] = 0
-
-        # we maken een priority queue aan
-        pq = [(0, source)]
+        distances[source_id] = 0
 
-        # we zetten het om in een queue object
-        heapify(pq)
+        # we maken een priority queue aan, een lijst met één element is al een geldige heap
+        pq = [(0, source_id)]
 
         # hier wordt opgeslagen hoe we bij elk station komen
-        predecessors = {station: None for station in self.rail_network.stations}
+        predecessors = [None] * len(adjacency)
         
         # we creëren een Route object met tijdslimiet
         route = Route(self.time_limit)
 
+        # het eindstation is het station met de langste afstand vanaf source
+        end_station = None
+        max_distance = 0
+
         # zolang de priority queue niet leeg is
         while len(pq) > 0:
 
@@ -65,15 +71,25 @@ class DijkstraAlgorithm:
             if current_distance > self.time_limit:
                 break
 
+            # er is al een kortere afstand gevonden, dit is een verouderde entry in de queue
+            if current_distance > distances[current_station]:
+                continue
+
+            # de afstand van current_station ligt nu vast, dus we houden hier direct het verste station bij
+            # stations komen in volgorde van (afstand, id) uit de queue, bij gelijke afstand wint het laagste id
+            if current_distance > max_distance:
+                max_distance = current_distance
+                end_station = current_station
+
             # we gaan alle bestaande connecties van current_station af
-            for neighbor, connection in self.rail_network.stations[current_station].connections.items():
+            for neighbor, connection_distance, connection in adjacency[current_station]:
 
                 # als de connectie al doorlopen is, gaan we naar de volgende
                 if connection in visited_connections:
                     continue
                 
                 # we berekenen de nieuwe afstand
-                distance = current_distance + connection.distance
+                distance = current_distance + connection_distance
                 
                 # als de afstand nu korter is, en binnen het tijdslimiet, vervangen we de afstand
                 if distance < distances[neighbor] and distance <= self.time_limit:
@@ -85,27 +101,24 @@ class DijkstraAlgorithm:
                     # we slaan op via welke connectie we bij neighbor komen
                     predecessors[neighbor] = (current_station, connection)
 
-        path = []
-        end_station = None
-        max_distance = 0
-        
-        # we kiezen als eindstation het station met de langste afstand vanaf source
-        for station in distances:
-            if distances[station] <= self.time_limit and predecessors[station] is not None:
-                if distances[station] > max_distance:
-                    max_distance = distances[station]
-                    end_station = station
-
-        # we slaan alle connecties op vanaf eind station
-        while end_station is not None and predecessors[end_station] is not None:
+        # er is geen station bereikbaar, dus de route blijft leeg
+        if end_station is None:
+            return route
+
+        # we lopen via de voorgangers terug van eind station naar source
+        # de richting van elke connectie is dan al bekend, dus we bouwen de route direct op
+        station_names = self.rail_network.station_names
+        path = [station_names[end_station]]
+        while predecessors[end_station] is not None:
             previous_station, connection = predecessors[end_station]
-            path.append((previous_station, end_station, connection))
+            path.append(station_names[previous_station])
+            route.connections_used.add(connection)
+            connection.used = True
             end_station = previous_station
 
         path.reverse()
-        # we voegen alle verbindingen van path toe aan de route
-        for prev_station, next_station, connection in path:
-            self.add_connection_to_route(route, connection)
+        route.stations = path
+        route.total_time = max_distance
 
         return route
 
@@ -157,55 +170,6 @@ class DijkstraAlgorithm:
         return start_station
 
 
-    def add_connection_to_route(self, route: Route, connection: Connection) -> bool:
-        """
-        Voegt de juiste verbinding toe aan de route, zolang de route binnen het tijdslimiet blijft
-        
-        Args:
-            route (Route): route waar verbinding aan wordt toegevoegd
-            connection (Connection): de verbinding die toegevoegd moet worden
-            
-        Returns:
-            bool: True als de verbinding is succesvol is toegevoegd, anders False
-        """
-        # we houden bij of tijdslimiet is overschreden
-        if route.total_time + connection.distance > route.time_limit:
-            return False
-
-        # we updaten de totale tijd
-        route.total_time += connection.distance
-
-        # als de route leeg is, voegen we beide stations toe
-        if not route.stations:
-            route.stations.extend([connection.station1, connection.station2])
-
-        else:
-            # we pakken het laatste station uit de route
-            last_station = route.stations[-1]
-            # we willen de goede verbinding toevoegen
-            if last_station == connection.station1:
-                route.stations.append(connection.station2)
-            elif last_station == connection.station2:
-                route.stations.append(connection.station1)
-
-            # als de eerste connectie verkeerd om is geplaatst, draaien we de connectie om
-            elif len(route.stations) == 2:
-                first_station = route.stations[0]
-                if first_station == connection.station1:
-                    route.stations[0], route.stations[-1] = route.stations[-1], route.stations[0]
-                    route.stations.append(connection.station2)
-                elif first_station == connection.station2:
-                    route.stations[0], route.stations[-1] = route.stations[-1], route.stations[0]
-                    route.stations.append(connection.station1)
-            else:
-                return False
-
-        # we voegen de verbinding toe aan connections_used
-        route.connections_used.add(connection)
-        connection.used = True
-        return True
-
-
     def find_best_solution(self, iterations: int = 1) -> Tuple[float, List[Route]]:
         """
         Zoekt naar de beste oplossing
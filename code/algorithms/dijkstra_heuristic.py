@@ -1,7 +1,7 @@
 # dijkstra_heuristic.py
 
 from heapq import heapify, heappop, heappush
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
 from classes.rail_network import RailNetwork
 from classes.route import Route
 from classes.connection import Connection
@@ -19,192 +19,205 @@ class DijkstraHeuristicAlgorithm:
         self.time_limit = time_limit
         self.max_routes = max_routes
 
-    def find_route(self, source: str, visited_connections: Set[Connection]) -> Route:
+    def find_route(self, source: str, visited_connections: Set[Connection],
+                   unvisited_stations: Optional[int] = None) -> Route:
         """
         Zoekt naar een route via Dijkstra's Algoritme.
         We slaan doorlopen connecties over.
         We hebben een tijdslimiet.
         Eind station is het station met de verste distance vanaf source
+        Stopt zodra alle stations met ondoorlopen connecties een vaste afstand hebben.
         
         Args:
             source: start station berekend via calculate_start_station
             visited_connections: Set met al doorlopen connecties
+            unvisited_stations: aantal stations met ondoorlopen connecties, moet kloppen met visited_connections;
+                als dit niet wordt meegegeven, tellen we het zelf
             
         Returns:
             Route: De gecreërde route
         """        
+        # we werken met de integer ids van de stations, zodat afstanden en voorgangers in lijsten passen
+        self.rail_network.ensure_station_index()
+        source_id = self.rail_network.station_ids[source]
+        adjacency = self.rail_network.adjacency
+
+        # de binnenste lus leest deze waardes heel vaak, dus we slaan ze lokaal op
+        time_limit = self.time_limit
+        push = heappush
+        pop = heappop
+
         # we zetten de afstanden naar alle stations op oneindig
-        distances = {station: float('inf') for station in self.rail_network.stations}
+        distances = [float('inf')] * len(adjacency)
         
         # we stellen de afstand naar source gelijk aan 0
-        distances[source] = 0
+        distances[source_id] = 0
 
-        # we maken een priority queue aan
-        pq = [(0, source)]
-
-        # we zetten het om in een queue object
-        heapify(pq)
+        # we maken een priority queue aan, een lijst met één element is al een geldige heap
+        pq = [(0, source_id)]
 
         # hier wordt opgeslagen hoe we bij elk station komen
-        predecessors = {station: None for station in self.rail_network.stations}
+        predecessors = [None] * len(adjacency)
         
         # we creëren een Route object met tijdslimiet
-        route = Route(self.time_limit)
+        route = Route(time_limit)
+
+        # het eindstation is het station met de langste afstand vanaf source
+        end_station = None
+        max_distance = 0
+
+        # we kunnen alleen stations bereiken die nog ondoorlopen connecties hebben
+        # als die allemaal een vaste afstand hebben, staan er alleen nog verouderde entries in de queue
+        # find_best_solution houdt dit aantal al bij, bij een losse aanroep tellen we het met visited_connections
+        if unvisited_stations is None:
+            unvisited_stations = len({
+                station
+                for conn in self.rail_network.connections if conn not in visited_connections
+                for station in (conn.station1, conn.station2)
+            })
+        remaining_stations = unvisited_stations
 
         # zolang de priority queue niet leeg is
-        while len(pq) > 0:
+        while pq:
 
             # we halen de node op met kortste afstand, dit wordt current_station (current_distance hoort hierbij)
-            current_distance, current_station = heappop(pq) 
+            current_distance, current_station = pop(pq) 
 
             # we stoppen als tijdslimiet is bereikt
-            if current_distance > self.time_limit:
+            if current_distance > time_limit:
+                break
+
+            # er is al een kortere afstand gevonden, dit is een verouderde entry in de queue
+            if current_distance > distances[current_station]:
+                continue
+
+            # de afstand van current_station ligt nu vast, dus we houden hier direct het verste station bij
+            # stations komen in volgorde van (afstand, id) uit de queue, bij gelijke afstand wint het laagste id
+            if current_distance > max_distance:
+                max_distance = current_distance
+                end_station = current_station
+
+            # alle bereikbare stations zijn afgehandeld, verder zoeken levert niets meer op
+            remaining_stations -= 1
+            if not remaining_stations:
                 break
 
             # we gaan alle bestaande connecties van current_station af
-            for neighbor, connection in self.rail_network.stations[current_station].connections.items():
+            for neighbor, connection_distance, connection in adjacency[current_station]:
 
                 # als de connectie al doorlopen is, gaan we naar de volgende
                 if connection in visited_connections:
                     continue
                 
                 # we berekenen de nieuwe afstand
-                distance = current_distance + connection.distance
+                distance = current_distance + connection_distance
                 
                 # als de afstand nu korter is, en binnen het tijdslimiet, vervangen we de afstand
-                if distance < distances[neighbor] and distance <= self.time_limit:
+                if distance < distances[neighbor] and distance <= time_limit:
                     distances[neighbor] = distance
 
                     # we voegen de afstand toe aan de priority que
-                    heappush(pq, (distance, neighbor))
+                    push(pq, (distance, neighbor))
                     
                     # we slaan op via welke connectie we bij neighbor komen
                     predecessors[neighbor] = (current_station, connection)
 
-        path = []
-        end_station = None
-        max_distance = 0
-        
-        # we kiezen als eindstation het station met de langste afstand vanaf source
-        for station in distances:
-            if distances[station] <= self.time_limit and predecessors[station] is not None:
-                if distances[station] > max_distance:
-                    max_distance = distances[station]
-                    end_station = station
-
-        # we slaan alle connecties op vanaf eind station
-        while end_station is not None and predecessors[end_station] is not None:
+        # er is geen station bereikbaar, dus de route blijft leeg
+        if end_station is None:
+            return route
+
+        # we lopen via de voorgangers terug van eind station naar source
+        # de richting van elke connectie is dan al bekend, dus we bouwen de route direct op
+        station_names = self.rail_network.station_names
+        path = [station_names[end_station]]
+        while predecessors[end_station] is not None:
             previous_station, connection = predecessors[end_station]
-            path.append((previous_station, end_station, connection))
+            path.append(station_names[previous_station])
+            route.connections_used.add(connection)
+            connection.used = True
             end_station = previous_station
 
         path.reverse()
-        # we voegen alle verbindingen van path toe aan de route
-        for prev_station, next_station, connection in path:
-            self.add_connection_to_route(route, connection)
+        route.stations = path
+        route.total_time = max_distance
 
         return route
 
 
-    def calculate_start_station(self, visited_connections: Set[Connection]) -> str:
+    def count_unvisited_connections(self):
+        """
+        Slaat per station de ondoorlopen connecties op aan het begin van een oplossing.
+        Daarna wordt dit per gevonden route bijgewerkt met update_unvisited_connections,
+        zodat we niet elke keer alle connecties opnieuw hoeven te tellen.
+        """
+        # per station een lijst met (positie, connectie) van de ondoorlopen verbindingen
+        # de positie volgt de volgorde van de connecties, station 1 komt voor station 2
+        self._unvisited_connections = {}
+
+        for i, conn in enumerate(self.rail_network.connections):
+            self._unvisited_connections.setdefault(conn.station1, []).append((2 * i, conn))
+            self._unvisited_connections.setdefault(conn.station2, []).append((2 * i + 1, conn))
+
+        # heap met (aantal ondoorlopen connecties, eerste positie, station), zodat het minimum bovenaan staat
+        # bij gelijke aantallen wint het station dat als eerste in een ondoorlopen connectie voorkomt
+        self._degree_heap = [
+            (len(connections), connections[0][0], station)
+            for station, connections in self._unvisited_connections.items()
+        ]
+        heapify(self._degree_heap)
+
+    def update_unvisited_connections(self, route: Route):
+        """
+        Haalt de connecties van de route weg bij de ondoorlopen connecties van hun stations.
+
+        Args:
+            route (Route): de route die net aan de oplossing is toegevoegd
+        """
+        used = route.connections_used
+        touched_stations = {station for conn in used for station in (conn.station1, conn.station2)}
+
+        for station in touched_stations:
+            connections = [
+                (position, conn) for position, conn in self._unvisited_connections[station]
+                if conn not in used
+            ]
+
+            # stations zonder ondoorlopen connecties halen we weg
+            if not connections:
+                del self._unvisited_connections[station]
+                continue
+
+            # de oude entry in de heap laten we staan, die wordt overgeslagen in calculate_start_station
+            self._unvisited_connections[station] = connections
+            heappush(self._degree_heap, (len(connections), connections[0][0], station))
+
+    def calculate_start_station(self) -> str:
         """
         Kiest als start station eerst de stations die maar één connectie hebben.
         Daarna kiest als startstation het station met de minste ondoorlopen connecties.
+        Gebruikt de ondoorlopen connecties van count_unvisited_connections en update_unvisited_connections.
         
-        Args:
-            visited_connections: Set met doorlopen connecties
-            
         Returns:
             str: gekozen start station
         """
-        # Dictionary om ondoorlopen verbindingen per station op te slaan
-        start_stations = {}
-        
-        for conn in self.rail_network.connections:
+        start_stations = self._unvisited_connections
 
-            # we kijken alleen naar de ondoorlopen verbindingen
-            if conn not in visited_connections:
-
-                # voeg station 1 toe aan start_stations, als deze nog niet erin staat
-                if conn.station1 not in start_stations:
-                    start_stations[conn.station1] = 0
-
-                # voeg station 2 toe aan start_stations, als deze nog niet erin staat
-                if conn.station2 not in start_stations:
-                    start_stations[conn.station2] = 0
-                
-                # we tellen 1 (ondoorlopen verbinding) op bij het station
-                start_stations[conn.station1] += 1
-                start_stations[conn.station2] += 1
-        
         # als de dictionary leeg is, returnen we None
         if not start_stations:
             return None
 
-        # We zoeken naar stations met 1 connectie
-        for station, connection_count in start_stations.items():
-            if connection_count == 1:
-                return station
-                
-        # als geen station maar één connectie heeft, zoeken we naar station met de minste connecties
-        min_connections = 0
-        start_station = None
-        
-        for station, connection_count in start_stations.items():
-            if connection_count < min_connections:
-                min_connections = connection_count
-                start_station = station
-        
-        # we returnen het station met de meest ondoorlopen verbindingen
-        return start_station
-
-    def add_connection_to_route(self, route: Route, connection: Connection) -> bool:
-        """
-        Voegt de juiste verbinding toe aan de route, zolang de route binnen het tijdslimiet blijft
-        
-        Args:
-            route (Route): route waar verbinding aan wordt toegevoegd
-            connection (Connection): de verbinding die toegevoegd moet worden
-            
-        Returns:
-            bool: True als de verbinding is succesvol is toegevoegd, anders False
-        """
-        # we houden bij of tijdslimiet is overschreden
-        if route.total_time + connection.distance > route.time_limit:
-            return False
-
-        # we updaten de totale tijd
-        route.total_time += connection.distance
-
-        # als de route leeg is, voegen we beide stations toe
-        if not route.stations:
-            route.stations.extend([connection.station1, connection.station2])
-
-        else:
-            # we pakken het laatste station uit de route
-            last_station = route.stations[-1]
-            # we willen de goede verbinding toevoegen
-            if last_station == connection.station1:
-                route.stations.append(connection.station2)
-            elif last_station == connection.station2:
-                route.stations.append(connection.station1)
-
-            # als de eerste connectie verkeerd om is geplaatst, draaien we de connectie om
-            elif len(route.stations) == 2:
-                first_station = route.stations[0]
-                if first_station == connection.station1:
-                    route.stations[0], route.stations[-1] = route.stations[-1], route.stations[0]
-                    route.stations.append(connection.station2)
-                elif first_station == connection.station2:
-                    route.stations[0], route.stations[-1] = route.stations[-1], route.stations[0]
-                    route.stations.append(connection.station1)
-            else:
-                return False
+        # we halen verouderde entries van de heap, tot het minimum overeenkomt met de huidige stand
+        heap = self._degree_heap
+        while True:
+            connection_count, position, station = heap[0]
+            connections = start_stations.get(station)
+            if connections and len(connections) == connection_count and connections[0][0] == position:
+                break
+            heappop(heap)
 
-        # we voegen de verbinding toe aan connections_used
-        route.connections_used.add(connection)
-        connection.used = True
-        return True
+        # elk station in de heap heeft minstens 1 ondoorlopen connectie, dus het minimum bovenaan
+        # is een station met 1 connectie als dat er is, en anders het station met de minste connecties
+        return station
 
     def find_best_solution(self, iterations: int = 1) -> Tuple[float, List[Route]]:
         """
@@ -219,16 +232,20 @@ class DijkstraHeuristicAlgorithm:
         # we houden de bezochte connecties bij
         visited_connections = set()
 
+        # we tellen één keer per station de ondoorlopen connecties
+        self.count_unvisited_connections()
+
         # zolang het maximale aantal routes niet overschreden wordt
         while len(routes) < self.max_routes:
 
             # we zoeken een start_station
-            start_station = self.calculate_start_station(visited_connections)
+            start_station = self.calculate_start_station()
             if start_station is None:
                 break
 
             # we vinden de route vanaf start_station
-            route = self.find_route(start_station, visited_connections)
+            # _unvisited_connections bevat precies de stations met connecties buiten visited_connections
+            route = self.find_route(start_station, visited_connections, len(self._unvisited_connections))
             
             # als de route leeg is (geen verbindingen gebruikt)
             if not route.connections_used:
@@ -237,6 +254,7 @@ class DijkstraHeuristicAlgorithm:
             # we voegen de route toe aan routes en voegen de gebruikte connecties toe aan visited_connections
             routes.append(route)
             visited_connections.update(route.connections_used)
+            self.update_unvisited_connections(route)
 
         routes = self.combine_routes(routes)
 
@@ -259,41 +277,40 @@ class DijkstraHeuristicAlgorithm:
         """
         if not routes:
             return routes
-            
-        i = 0
-        while i < len(routes) - 1:
-            route1 = routes[i]
-            route2 = routes[i + 1]
-            
+
+        time_limit = self.time_limit
+        stations = self.rail_network.stations
+
+        # we lopen één keer over de routes en plakken elke route zo mogelijk achter de vorige
+        combined_routes = [routes[0]]
+        for route2 in routes[1:]:
+            route1 = combined_routes[-1]
+            total_time = route1.total_time + route2.total_time
+
             # We kijken of deze routes samen de tijd al overschreiden
-            if route1.total_time + route2.total_time >= self.time_limit:
-                i += 1
+            if total_time >= time_limit:
+                combined_routes.append(route2)
                 continue
-            
-            # we pakken het laatste station van route 1 en het eerste station van route 2
-            end_station = route1.stations[-1]
-            start_station = route2.stations[0]
-            
-            # We kijken of deze twee station gecombineert kunnen worden
-            connection = self.rail_network.stations[end_station].connections.get(start_station)
-            
+
+            # We kijken of het laatste station van route 1 en het eerste station van route 2 verbonden zijn
+            connection = stations[route1.stations[-1]].connections.get(route2.stations[0])
+
             # als de connectie bestaat en dit totale traject niet het tijdslimiet overschreidt
-            if (connection and route1.total_time + route2.total_time + connection.distance <= self.time_limit):
-                
+            if connection and total_time + connection.distance <= time_limit:
+
                 # we creëren en updaten alles van deze nieuwe route
-                combined_route = Route(self.time_limit)
+                combined_route = Route(time_limit)
                 combined_route.stations = route1.stations + route2.stations
                 combined_route.connections_used = route1.connections_used | route2.connections_used
                 combined_route.connections_used.add(connection)
-                combined_route.total_time = route1.total_time + route2.total_time + connection.distance
-                
-                # we vervangen routes[i] door de gecombineerde route, en we verwijderen routes[i+1] uit routes
-                routes[i] = combined_route
-                routes.pop(i + 1)
-            
+                combined_route.total_time = total_time + connection.distance
+
+                # de gecombineerde route vervangt route 1, zodat ook de volgende route er nog achter kan
+                combined_routes[-1] = combined_route
+
             # als we geen connectie hebben gevonden om deze trajecten te verbinden
             else:
-                i += 1
-                
-        return routes
+                combined_routes.append(route2)
+
+        return combined_routes
     
\ No newline at end of file
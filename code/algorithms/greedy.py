@@ -22,6 +22,12 @@ class GreedyAlgorithm:
         # Gebruik de tijdslimiet
         self.max_time = time_limit  
 
+        # Stations gesorteerd op aantal verbindingen, opgebouwd in runGreedy
+        self.sorted_stations = []
+
+        # De adjacency waarvoor sorted_stations is opgebouwd
+        self.sorted_for_adjacency = None
+
     def get_most_connections(self) -> List[Station]:
         """
         Verkrijg een lijst van stations gesorteerd op het aantal verbindingen, van de minste naar de meeste.
@@ -48,30 +54,34 @@ class GreedyAlgorithm:
             Route: De gemaakte route.
         """
         # Geef de tijdslimiet door
-        route = Route(time_limit=self.max_time)
-        current_station = start_station.name
+        max_time = self.max_time
+        route = Route(time_limit=max_time)
+        self.network.ensure_station_index()
+        current_id = self.network.station_ids[start_station.name]
+        adjacency = self.network.adjacency
 
         # Houd bij welke stations al bezocht zijn in deze route
         visited_stations = set()  
 
-        while True:
-            station = self.network.stations[current_station]
+        # Resterende tijd van de route, alleen bijgewerkt als er een verbinding wordt toegevoegd
+        remaining = max_time
 
+        while True:
             # Markeer het station als bezocht
-            visited_stations.add(current_station)  
+            visited_stations.add(current_id)  
 
             # Verkrijg alle geldige verbindingen die:
             # 1. Nog niet gebruikt zijn.
             # 2. De maximale tijdslimiet niet overschrijden.
             # 3. Naar stations leiden die nog niet bezocht zijn in deze route.
-            for _, conn in station.connections.items():
-                if not conn.used and route.total_time + conn.distance <= self.max_time:
-                    other_station = conn.get_other_station(current_station)
-                    if other_station not in visited_stations:
+            for other_id, distance, conn in adjacency[current_id]:
+                if not conn.used and distance <= remaining:
+                    if other_id not in visited_stations:
                         # Voeg de ongebruikte verbinding direct toe aan de route
                         if route.add_connection(conn):
                             # Als verbinding succesvol is toegevoegd, werk huidige station bij
-                            current_station = other_station
+                            current_id = other_id
+                            remaining -= distance
                             # Ga verder met de volgende verbinding na toevoeging
                             break  
             else:
@@ -92,24 +102,26 @@ class GreedyAlgorithm:
             conn.used = False
         self.network.routes.clear()
 
-        # Verkrijg de gesorteerde lijst van stations op basis van het aantal verbindingen
-        sorted_stations = self.get_most_connections()
+        # De volgorde van de stations verandert alleen als er stations of verbindingen bijkomen,
+        # en dan bouwt ensure_station_index een nieuwe adjacency op
+        self.network.ensure_station_index()
+        if self.sorted_for_adjacency is not self.network.adjacency:
+            # Verkrijg de gesorteerde lijst van stations op basis van het aantal verbindingen
+            self.sorted_stations = self.get_most_connections()
+            self.sorted_for_adjacency = self.network.adjacency
+        sorted_stations = self.sorted_stations
 
-        # Houd bij welke stations al als startpunt zijn gebruikt
-        used_stations = set()  
+        # Aantal verbindingen dat nog niet gebruikt is, zodat we kunnen stoppen als alles bereden is
+        unused_connections = len(self.network.connections)
 
+        # Elk station komt precies één keer voor in sorted_stations, dus wordt ook maar één keer startpunt
         for start_station in sorted_stations:
-            # Controleer of het station beschikbare verbindingen heeft
-            if start_station.name in used_stations:
-                # Sla station over als het al als startpunt is gebruikt
-                continue  
-
-            # Markeer het station als gebruikt
-            used_stations.add(start_station.name)
-
             # Maak een route die begint bij het huidige station
             route = self.create_route(start_station)
 
+            # Ook verbindingen van routes die niet worden toegevoegd zijn als gebruikt gemarkeerd
+            unused_connections -= len(route.connections_used)
+
             # Voeg de route toe aan het netwerk alleen als deze meer dan 2 stations bevat
             if route.connections_used and len(route.stations) > 2:
                 self.network.routes.append(route)
@@ -118,6 +130,10 @@ class GreedyAlgorithm:
             if len(self.network.routes) >= self.max_routes:
                 break
 
+            # Zonder ongebruikte verbindingen levert geen enkel volgend station nog een route op
+            if not unused_connections:
+                break
+
         # Bereken en retourneer de kwaliteit van de gemaakte routes
         return self.network.calculate_quality()
 
@@ -132,10 +148,5 @@ class GreedyAlgorithm:
             Tuple[float, List[Route]]: Een tuple met de kwaliteitsscore en de bijbehorende lijst van routes.
         """
         quality = self.runGreedy()
-        best_routes = [Route() for _ in self.network.routes]
-        for new_route, old_route in zip(best_routes, self.network.routes):
-            new_route.stations = old_route.stations.copy()
-            new_route.total_time = old_route.total_time
-            new_route.connections_used = old_route.connections_used.copy()
-        
-        return quality, best_routes
+        # De routes worden na deze run niet meer aangepast, dus kopiëren is niet nodig
+        return quality, list(self.network.routes)
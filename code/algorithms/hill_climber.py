@@ -1,8 +1,13 @@
+import hashlib
+import json
+import math
+import os
 import random
-from copy import deepcopy
-from typing import List, Tuple
+from collections import Counter
+from typing import List, Optional, Tuple
 from classes.rail_network import RailNetwork
 from classes.route import Route
+from algorithms.parallel import best_of_runs
 
 class HillClimber:
     def __init__(self, network: RailNetwork, time_limit: int = 120, max_routes: int = 7, seed: int = 42):
@@ -19,12 +24,15 @@ class HillClimber:
         self.time_limit = time_limit
         self.max_routes = max_routes
         
-        # Houd gebruikte stations globaal bij
-        self.used_stations_track = set() 
+        # Houd per verbinding (als stationspaar, kleinste station eerst) bij hoe vaak deze in de routes voorkomt
+        self.used_connection_counts = Counter()
         
         # Houd gebruikte verbindingen globaal bij
         self.used_connections = set()  
 
+        # De stationsnamen veranderen niet, dus die hoeven niet bij elke wijziging opnieuw in een lijst
+        self.station_names = tuple(self.network.stations.keys())
+
         if seed is not None:
             random.seed(seed)
 
@@ -34,24 +42,48 @@ class HillClimber:
     # Mijn connecties tellen niet goed, daarom dit 
     def update_connection_count(self):
         """
-        Werk het aantal verbindingen bij op basis van de persistente `used_connections_track` set.
+        Tel de gebruikte verbindingen opnieuw voor alle huidige routes.
+        Tijdens het zoeken wordt dit per gewijzigde route bijgewerkt met
+        add_route_connections en remove_route_connections.
         """
-        
-        # Maak de set van gebruikte stations leeg
-        self.used_stations_track.clear()
+        self.used_connection_counts.clear()
         for route in self.current_routes:
-           
-            # Loop door de stations in de route, stop 1 station voor het laatste
-            for i in range(len(route.stations) - 1):
-                
-                # Het sorteren zorgt ervoor dat de verbinding tussen station A en B hetzelfde is als tussen B en A
-                conn = tuple(sorted((route.stations[i], route.stations[i + 1])))
-
-                # Voeg de verbinding toe aan de set van gebruikte verbindingen
-                self.used_stations_track.add(conn)
+            self.add_route_connections(route)
 
         # Sla het aantal unieke gebruikte verbindingen op in het netwerk
-        self.network.connections_used = len(self.used_stations_track)
+        self.network.connections_used = len(self.used_connection_counts)
+
+    def add_route_connections(self, route: Route):
+        """
+        Tel de verbindingen van een route op bij de gebruikte verbindingen.
+        """
+        counts = self.used_connection_counts
+        stations = route.stations
+
+        # Loop door de opeenvolgende stationsparen in de route
+        for station1, station2 in zip(stations, stations[1:]):
+
+            # Het kleinste station eerst, zodat de verbinding tussen A en B hetzelfde is als tussen B en A
+            counts[(station1, station2) if station1 <= station2 else (station2, station1)] += 1
+
+        self.network.connections_used = len(counts)
+
+    def remove_route_connections(self, route: Route):
+        """
+        Haal de verbindingen van een route weg uit de gebruikte verbindingen.
+        """
+        counts = self.used_connection_counts
+        stations = route.stations
+
+        for station1, station2 in zip(stations, stations[1:]):
+            conn = (station1, station2) if station1 <= station2 else (station2, station1)
+            counts[conn] -= 1
+
+            # Verbindingen die in geen enkele route meer zitten, tellen niet meer mee
+            if not counts[conn]:
+                del counts[conn]
+
+        self.network.connections_used = len(counts)
 
     def generate_random_routes(self) -> List[Route]:
         """
@@ -60,19 +92,11 @@ class HillClimber:
         
         routes = []
         for _ in range(self.max_routes):
-            start_station = random.choice(list(self.network.stations.keys()))
+            start_station = random.choice(self.station_names)
             new_route = self.network.create_route(start_station)
 
-            # Verwijder dubbele stations
-            unique_stations = []
-            seen_stations = set()
-            for station in new_route.stations:
-                if station not in seen_stations:
-                    unique_stations.append(station)
-                    seen_stations.add(station)
-
-            # Werk de route bij met unieke stations
-            new_route.stations = unique_stations
+            # Verwijder dubbele stations, dict.fromkeys behoudt de volgorde
+            new_route.stations = list(dict.fromkeys(new_route.stations))
 
             # Zorg ervoor dat de route minstens twee geldige verbindingen heeft
             if len(new_route.stations) >= 2:
@@ -82,88 +106,190 @@ class HillClimber:
 
     def copy_routes(self, routes: List[Route]) -> List[Route]:
         """
-        Maak een diepe kopie van routes om de originele niet te wijzigen.
+        Maak een kopie van routes om de originele niet te wijzigen.
         """
-        return deepcopy(routes)
+        return [route.copy() for route in routes]
 
     def modify_route(self, route: Route) -> Route:
         """
-        Wijzig een route door een van de volgende strategieën te gebruiken:
-        1. Start de route vanaf een willekeurig station.
-        2. Vervang de route volledig door een nieuwe willekeurige route.
+        Wijzig een route door deze te vervangen door een nieuwe willekeurige route
+        vanaf een willekeurig station.
         """
-        
-        # Kies een strategie willekeurig
-        option = random.choice([1, 2])
-        
-        if option == 1:
-            # Strategie 1: Start de route vanaf een willekeurig station
-            start_station = random.choice(list(self.network.stations.keys()))
-            new_route = self.network.create_route(start_station)
-        else:
-            # Strategie 2: Vervang de route volledig door een nieuwe willekeurige route
-            start_station = random.choice(list(self.network.stations.keys()))
-            new_route = self.network.create_route(start_station)
+        start_station = random.choice(self.station_names)
+        new_route = self.network.create_route(start_station)
+
+        # Verwijder dubbele stations, dict.fromkeys behoudt de volgorde
+        new_route.stations = list(dict.fromkeys(new_route.stations))
+        return new_route
 
-        # Maak een lege lijst om de unieke stations op te slaan
-        unique_stations = []
+    def cache_path(self, cache_dir: str, *settings) -> str:
+        """
+        Bepaal het cachebestand voor een run op basis van het netwerk en welke verbindingen
+        gebruikt zijn, de startroutes, de toestand van de random generator en de instellingen van de run.
+        """
+        key = repr((
+            [(conn.station1, conn.station2, conn.distance) for conn in self.network.connections],
+            # modify_route slaat gebruikte verbindingen over, dus die bepalen ook de uitkomst
+            [conn.used for conn in self.network.connections],
+            [route.stations for route in self.current_routes],
+            random.getstate(),
+            settings,
+        ))
+        digest = hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+        return os.path.join(cache_dir, f"hillclimb_{digest}.json")
 
-        # Maak een set om bij te houden welke stations al zijn toegevoegd
-        seen_stations = set()
+    def load_cached_solution(self, path: str) -> Tuple[float, List[Route]]:
+        """
+        Lees een eerder opgeslagen oplossing in, verbindingen worden opgeslagen als index in network.connections.
+        """
+        with open(path) as f:
+            data = json.load(f)
 
-        # Loop door alle stations in de nieuwe route
-        for station in new_route.stations:
-            # Als het station nog niet in de set 'seen_stations' zit
-            if station not in seen_stations:
-                unique_stations.append(station)
-                seen_stations.add(station)
-        new_route.stations = unique_stations
-        return new_route
+        connections = self.network.connections
+        routes = []
+        for route_data in data['routes']:
+            route = Route(route_data['time_limit'])
+            route.stations = route_data['stations']
+            route.total_time = route_data['total_time']
+            route.connections_used = {connections[index] for index in route_data['connections']}
+            routes.append(route)
 
-    def find_best_solution(self, iterations: int = 1000) -> Tuple[float, List[Route]]:
+        return data['quality'], routes
+
+    def save_cached_solution(self, path: str, quality: float, routes: List[Route]):
+        """
+        Sla een oplossing op zodat een volgende run met dezelfde invoer deze direct kan teruggeven.
+        """
+        index = {conn: i for i, conn in enumerate(self.network.connections)}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'quality': quality,
+                'routes': [{
+                    'stations': route.stations,
+                    'total_time': route.total_time,
+                    'time_limit': route.time_limit,
+                    'connections': sorted(index[conn] for conn in route.connections_used),
+                } for route in routes],
+            }, f)
+
+    def find_best_solution(self, iterations: int = 1000, simulated_annealing: bool = False,
+                           start_temperature: float = 100.0, cooling: float = 0.995,
+                           use_cache: bool = False, cache_dir: str = 'cache') -> Tuple[float, List[Route]]:
         """
         Voer de hill-climber uit om de routes voor het netwerk te optimaliseren.
+
+        Args:
+            iterations: Aantal iteraties.
+            simulated_annealing: Accepteer ook verslechteringen met kans exp(delta / temperatuur).
+            start_temperature: Begintemperatuur voor simulated annealing.
+            cooling: Factor waarmee de temperatuur na elke iteratie wordt vermenigvuldigd.
+            use_cache: Hergebruik het resultaat van een eerdere run met precies dezelfde invoer.
+            cache_dir: Map waarin de resultaten worden opgeslagen.
+
+        Raises:
+            ValueError: Als start_temperature niet positief is of cooling niet in (0, 1] ligt.
         """
-        
+        if simulated_annealing:
+            if start_temperature <= 0:
+                raise ValueError("start_temperature moet groter zijn dan 0")
+            if not 0 < cooling <= 1:
+                raise ValueError("cooling moet groter zijn dan 0 en hoogstens 1")
+
+        if use_cache:
+            path = self.cache_path(cache_dir, iterations, simulated_annealing, start_temperature, cooling)
+            if os.path.exists(path):
+                best_quality, best_routes = self.load_cached_solution(path)
+
+                # Ga verder vanaf de beste routes, zoals na een gewone hill-climb
+                self.current_routes = self.copy_routes(best_routes)
+                self.network.routes = self.current_routes
+                self.update_connection_count()
+                return best_quality, best_routes
+
+        # Het netwerk wijst naar dezelfde lijst, wijzigingen in current_routes zijn dus direct zichtbaar
         self.network.routes = self.current_routes
     
         # Bereken de initiële kwaliteit van de huidige routes
         initial_quality = self.network.calculate_quality()
         best_quality = initial_quality
+
+        # Zonder simulated annealing is de huidige oplossing altijd ook de beste
+        current_quality = initial_quality
+        temperature = start_temperature
         
-        # Maak een kopie van de huidige routes voor het bijhouden van de beste oplossing
-        best_routes = self.copy_routes(self.current_routes)
-        i = 0
-        while i < iterations:
-            # Kies willekeurig een route uit de huidige routes
-            route = random.choice(self.current_routes)
-            
-            # Zoek de index van de geselecteerde route in de lijst
-            route_idx = self.current_routes.index(route)
+        # Onthoud de huidige routes als beste oplossing
+        # modify_route maakt altijd een nieuwe Route, dus een ondiepe kopie van de lijst is genoeg
+        best_routes = self.current_routes[:]
+        for _ in range(iterations):
+            # Kies willekeurig de index van een route uit de huidige routes, zodat we die niet hoeven op te zoeken
+            route_idx = random.randrange(len(self.current_routes))
+            route = self.current_routes[route_idx]
             
-            # Maak een diepe kopie van de geselecteerde route als het terug moet
-            old_route = deepcopy(route)
+            # Bewaar de geselecteerde route als het terug moet, modify_route past deze niet aan
+            old_route = route
             new_route = self.modify_route(route)
             
             # Zet de gewijzigde route op de oorspronkelijke plek in de lijst
             self.current_routes[route_idx] = new_route
             
-            # Werk de verbindingen bij die door de routes gebruikt worden
-            self.update_connection_count()
+            # Werk alleen de verbindingen bij van de route die veranderd is
+            self.remove_route_connections(old_route)
+            self.add_route_connections(new_route)
             
-            # Werk het netwerk bij met de nieuwe routes
-            self.network.routes = self.current_routes
-
             # Bereken de kwaliteit van de nieuwe routes
             new_quality = self.network.calculate_quality()
 
-            if new_quality > best_quality:
-                # Update de beste kwaliteit
-                best_quality = new_quality
-                best_routes = self.copy_routes(self.current_routes)
+            delta = new_quality - current_quality
+            # Als de temperatuur naar 0 is afgerond, accepteren we net als de gewone hill-climber geen verslechteringen
+            if delta > 0 or (simulated_annealing and temperature > 0
+                             and random.random() < math.exp(delta / temperature)):
+                current_quality = new_quality
+
+                if new_quality > best_quality:
+                    # Update de beste kwaliteit
+                    best_quality = new_quality
+                    best_routes = self.current_routes[:]
             else:
                 # Zet de route terug naar de oude
                 self.current_routes[route_idx] = old_route
-                self.update_connection_count()
-            i += 1
+                self.remove_route_connections(new_route)
+                self.add_route_connections(old_route)
+
+            if simulated_annealing:
+                temperature *= cooling
+
+        # Pas aan het eind maken we één kopie, zodat de beste routes los staan van het netwerk
+        best_routes = self.copy_routes(best_routes)
+        if use_cache:
+            self.save_cached_solution(path, best_quality, best_routes)
         return best_quality, best_routes
+
+    @classmethod
+    def multi_start(cls, stations_file: str, connections_file: str, time_limit: int = 120,
+                    max_routes: int = 7, iterations: int = 1000, starts: int = 4, seed: int = 42,
+                    workers: Optional[int] = None) -> Tuple[float, List[Route]]:
+        """
+        Voer meerdere onafhankelijke hill climbers parallel uit en geef de beste oplossing terug.
+        Elke start krijgt een eigen proces, netwerk en seed (seed, seed + 1, ...).
+
+        Args:
+            stations_file: Pad naar het CSV-bestand met stations.
+            connections_file: Pad naar het CSV-bestand met verbindingen.
+            time_limit: Maximale tijdslimiet voor routes in minuten.
+            max_routes: Maximale aantal routes.
+            iterations: Aantal iteraties per hill climber.
+            starts: Aantal hill climbers.
+            seed: Seed van de eerste hill climber.
+            workers: Aantal processen, standaard het aantal processoren.
+
+        Returns:
+            Tuple[float, List[Route]]: Beste kwaliteit en bijbehorende routes
+        """
+        runs = [
+            (iterations, {'time_limit': time_limit, 'max_routes': max_routes, 'seed': start_seed})
+            for start_seed in range(seed, seed + starts)
+        ]
+
+        # Bij gelijke kwaliteit wint de start met de laagste seed
+        return best_of_runs(cls, stations_file, connections_file, runs, workers)
@@ -0,0 +1,61 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from classes.rail_network import RailNetwork
+from classes.route import Route
+
+
+def run_algorithm(algorithm_class, stations_file: str, connections_file: str, iterations: int,
+                  settings: dict) -> Tuple[float, List[Route]]:
+    """
+    Laad een eigen netwerk en voer het algoritme één keer uit.
+    Staat op moduleniveau, zodat het in een apart proces kan draaien.
+
+    Args:
+        algorithm_class: Klasse van het algoritme, aangemaakt als algorithm_class(network, **settings).
+        stations_file: Pad naar het CSV-bestand met stations.
+        connections_file: Pad naar het CSV-bestand met verbindingen.
+        iterations: Aantal iteraties voor find_best_solution.
+        settings: Overige argumenten voor het algoritme, zoals time_limit, max_routes en de seed.
+
+    Returns:
+        Tuple[float, List[Route]]: Kwaliteit en routes van deze run
+    """
+    network = RailNetwork()
+    network.load_stations(stations_file)
+    network.load_connections(connections_file)
+
+    algorithm = algorithm_class(network, **settings)
+    return algorithm.find_best_solution(iterations)
+
+
+def best_of_runs(algorithm_class, stations_file: str, connections_file: str,
+                 runs: List[Tuple[int, dict]], workers: Optional[int] = None) -> Tuple[float, List[Route]]:
+    """
+    Voer elke run in een apart proces uit met run_algorithm en geef de beste oplossing terug.
+
+    Args:
+        algorithm_class: Klasse van het algoritme.
+        stations_file: Pad naar het CSV-bestand met stations.
+        connections_file: Pad naar het CSV-bestand met verbindingen.
+        runs: Per run het aantal iteraties en de argumenten voor het algoritme.
+        workers: Aantal processen, standaard het aantal processoren.
+
+    Returns:
+        Tuple[float, List[Route]]: Beste kwaliteit en bijbehorende routes,
+        of (-inf, []) als er geen runs zijn, net als find_best_solution(0)
+    """
+    if not runs:
+        return float('-inf'), []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            run_algorithm,
+            [algorithm_class] * len(runs),
+            [stations_file] * len(runs),
+            [connections_file] * len(runs),
+            [iterations for iterations, _ in runs],
+            [settings for _, settings in runs]
+        ))
+
+    # Bij gelijke kwaliteit wint de eerste run
+    return max(results, key=lambda result: result[0])
@@ -1,10 +1,13 @@
+import os
 import random
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from classes.rail_network import RailNetwork
 from classes.route import Route
+from algorithms.parallel import best_of_runs
 
 class RandomAlgorithm:
-    def __init__(self, rail_network: RailNetwork, time_limit: int = 120, max_routes: int = 7):
+    def __init__(self, rail_network: RailNetwork, time_limit: int = 120, max_routes: int = 7,
+                 rng: Optional[random.Random] = None):
         """
         Initialize RandomAlgorithm.
         
@@ -12,11 +15,16 @@ class RandomAlgorithm:
             rail_network: The rail network to work with
             time_limit: Maximum time limit for routes in minutes
             max_routes: Maximum number of routes allowed
+            rng: Random generator to use, defaults to the global random module
         """
         self.rail_network = rail_network
         self.time_limit = time_limit
         self.max_routes = max_routes
-        
+        self.rng = rng if rng is not None else random
+
+        # Number of connections used by the last solution from create_solution
+        self.used_count = 0
+
     def create_route(self, start_station: str) -> Route:
         """
         Create a single route starting from the given station.
@@ -27,28 +35,7 @@ class RandomAlgorithm:
         Returns:
             Route: Created route object
         """
-        route = Route()
-        current_station = start_station
-        route.stations = [start_station]
-        
-        while True:
-            station = self.rail_network.stations[current_station]
-            possible_connections = [
-                conn for dest, conn in station.connections.items()
-                if not conn.used and route.total_time + conn.distance <= self.time_limit
-            ]
-            
-            if not possible_connections:
-                break
-                
-            connection = random.choice(possible_connections)
-            if not route.add_connection(connection):
-                break
-                
-            current_station = connection.get_other_station(current_station)
-            route.stations.append(current_station)
-            
-        return route
+        return self.rail_network.create_route(start_station, self.time_limit, self.rng)
 
     def create_solution(self, max_routes: int = None) -> float:
         """
@@ -63,30 +50,37 @@ class RandomAlgorithm:
         # Use instance default if not specified
         max_routes = max_routes or self.max_routes
         
-        for conn in self.rail_network.connections:
-            conn.used = False
-        self.rail_network.routes.clear()
+        self.rail_network.reset()
         
         routes_created = 0
-        all_stations = list(self.rail_network.stations.keys())
+        self.used_count = 0
+        
+        # Number of unused connections per station, stations without any are removed.
+        # The dict keeps the station order, so the random choice is the same as a full rescan.
+        unused_counts = {
+            name: len(station.connections)
+            for name, station in self.rail_network.stations.items()
+            if station.connections
+        }
         
         while routes_created < max_routes:
-            unused_stations = [
-                station.name for station in self.rail_network.stations.values()
-                if any(not conn.used for conn in station.connections.values())
-            ]
-            
-            if not unused_stations:
+            if not unused_counts:
                 break
                 
-            start_station = random.choice(unused_stations)
+            start_station = self.rng.choice(list(unused_counts))
             route = self.create_route(start_station)
             
             if route.connections_used:
                 for conn in route.connections_used:
                     conn.used = True
+                    for name in (conn.station1, conn.station2):
+                        unused_counts[name] -= 1
+                        if not unused_counts[name]:
+                            del unused_counts[name]
                 self.rail_network.routes.append(route)
                 routes_created += 1
+                # Routes only take unused connections, so they never overlap
+                self.used_count += len(route.connections_used)
         
         return self.rail_network.calculate_quality()
 
@@ -107,10 +101,37 @@ class RandomAlgorithm:
             quality = self.create_solution()
             if quality > best_quality:
                 best_quality = quality
-                best_routes = [Route() for _ in self.rail_network.routes]
-                for new_route, old_route in zip(best_routes, self.rail_network.routes):
-                    new_route.stations = old_route.stations.copy()
-                    new_route.total_time = old_route.total_time
-                    new_route.connections_used = old_route.connections_used.copy()
+                best_routes = [route.copy() for route in self.rail_network.routes]
+        
+        return best_quality, best_routes
+
+    @classmethod
+    def multi_start(cls, stations_file: str, connections_file: str, time_limit: int = 120,
+                    max_routes: int = 7, iterations: int = 1000, seed: int = 42,
+                    workers: Optional[int] = None) -> Tuple[float, List[Route]]:
+        """
+        Split the iterations over separate processes and return the best solution found.
+        Each process loads its own network and gets its own seed (seed, seed + 1, ...).
+        
+        Args:
+            stations_file: Path to the stations CSV file
+            connections_file: Path to the connections CSV file
+            time_limit: Maximum time limit for routes in minutes
+            max_routes: Maximum number of routes allowed
+            iterations: Total number of attempts over all processes
+            seed: Seed of the first process
+            workers: Number of processes, defaults to the number of processors
+            
+        Returns:
+            tuple[float, List[Route]]: Best quality score and corresponding routes
+        """
+        # With 0 iterations there are no runs, best_of_runs then returns (-inf, []) like find_best_solution(0)
+        workers = min(workers or os.cpu_count() or 1, iterations)
+        runs = [
+            (iterations // workers + (i < iterations % workers),
+             {'time_limit': time_limit, 'max_routes': max_routes, 'rng': random.Random(seed + i)})
+            for i in range(workers)
+        ]
         
-        return best_quality, best_routes
\ No newline at end of file
+        # On equal quality the process with the lowest seed wins
+        return best_of_runs(cls, stations_file, connections_file, runs, workers)
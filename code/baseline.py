@@ -1,9 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import List, Tuple, Dict
+from typing import Tuple, Dict
 import seaborn as sns
 import argparse
 import os
+import random
 import json
 from collections import defaultdict
 from classes.rail_network import RailNetwork
@@ -44,7 +45,8 @@ def load_algorithm_results(dataset: str) -> Dict[str, float]:
     
     return algorithm_means
 
-def analyze_random_solutions(config: dict, iterations: int = 10000000000, seed: int = 42) -> Tuple[List[float], dict]:
+def analyze_random_solutions(config: dict, iterations: int = 1000, seed: int = 42,
+                             max_samples: int = 1000000) -> Tuple[np.ndarray, dict]:
     """
     Run multiple iterations of the random algorithm and analyze the results.
     
@@ -52,12 +54,16 @@ def analyze_random_solutions(config: dict, iterations: int = 10000000000, seed:
         config (dict): Configuration dictionary with dataset-specific settings
         iterations (int): Number of random solutions to generate
         seed (int): Random seed for reproducibility
+        max_samples (int): Maximum number of scores to keep for the plot, beyond this a
+            uniform random sample of the scores is kept
         
     Returns:
-        Tuple[List[float], dict]: List of scores and dictionary with statistics
+        Tuple[np.ndarray, dict]: Array of (sampled) scores and dictionary with statistics
     """
-    # Zet de random seed voor reproduceerbaarheid
+    # Zet de random seed voor reproduceerbaarheid, het algoritme krijgt een eigen random generator
+    # np.random wordt alleen gebruikt om scores te samplen
     np.random.seed(seed)
+    rng = random.Random(seed)
     
     # Initialiseer netwerk en algoritme
     network = RailNetwork()
@@ -67,43 +73,71 @@ def analyze_random_solutions(config: dict, iterations: int = 10000000000, seed:
     algorithm = RandomAlgorithm(
         network,
         time_limit=config['time_limit'],
-        max_routes=config['max_routes']
+        max_routes=config['max_routes'],
+        rng=rng
     )
     
-    # Verzamel scores
-    scores = []
+    # Verzamel scores, bij meer iteraties dan max_samples houden we een steekproef bij (reservoir sampling)
+    scores = np.empty(min(iterations, max_samples), dtype=np.float64)
+    sample_size = len(scores)
     route_counts = defaultdict(int)
     connection_counts = defaultdict(int)
     
-    for _ in range(iterations):
+    # Lopende totalen voor de gemiddelden, de verdelingen worden ook teruggegeven
+    routes_sum = 0
+    connections_sum = 0
+    
+    # Lopend gemiddelde en kwadratensom (Welford), zodat de statistieken niet alle scores nodig hebben
+    mean = 0.0
+    m2 = 0.0
+    min_score = float('inf')
+    max_score = float('-inf')
+    
+    for i in range(iterations):
         quality = algorithm.create_solution(max_routes=config['max_routes'])
-        scores.append(quality)
+        
+        if i < sample_size:
+            scores[i] = quality
+        else:
+            # Elke score komt met kans sample_size / (i + 1) in de steekproef
+            j = np.random.randint(i + 1)
+            if j < sample_size:
+                scores[j] = quality
+        
+        delta = quality - mean
+        mean += delta / (i + 1)
+        m2 += delta * (quality - mean)
+        min_score = min(min_score, quality)
+        max_score = max(max_score, quality)
         
         # Volg statistieken over de oplossing
-        route_counts[len(network.routes)] += 1
-        total_connections = sum(1 for conn in network.connections if conn.used)
+        num_routes = len(network.routes)
+        route_counts[num_routes] += 1
+        routes_sum += num_routes
+        total_connections = algorithm.used_count
         connection_counts[total_connections] += 1
+        connections_sum += total_connections
     
     # Bereken statistieken
     stats = {
-        'mean': np.mean(scores),
-        'std': np.std(scores),
-        'min': np.min(scores),
-        'max': np.max(scores),
-        'avg_routes': sum(k * v for k, v in route_counts.items()) / iterations,
-        'avg_connections': sum(k * v for k, v in connection_counts.items()) / iterations,
+        'mean': mean,
+        'std': np.sqrt(m2 / iterations),
+        'min': min_score,
+        'max': max_score,
+        'avg_routes': routes_sum / iterations,
+        'avg_connections': connections_sum / iterations,
         'route_distribution': dict(route_counts),
         'connection_distribution': dict(connection_counts)
     }
     
     return scores, stats
 
-def plot_results(scores: List[float], stats: dict, dataset: str, algorithm_means: Dict[str, float], save_path: str = None):
+def plot_results(scores: np.ndarray, stats: dict, dataset: str, algorithm_means: Dict[str, float], save_path: str = None):
     """
     Create visualizations of the random algorithm results with algorithm comparisons.
     
     Args:
-        scores (List[float]): List of quality scores
+        scores (np.ndarray): Array of quality scores
         stats (dict): Dictionary containing statistics
         dataset (str): Name of the dataset being analyzed
         algorithm_means (Dict[str, float]): Dictionary with mean scores per algorithm
@@ -122,10 +156,14 @@ def plot_results(scores: List[float], stats: dict, dataset: str, algorithm_means
     colors = ['#2ecc71', '#3498db', '#9b59b6', '#f1c40f', '#e74c3c', '#1abc9c', '#e67e22', '#34495e']
     color_idx = 0
     
+    # Sorteer de scores één keer, daarna is het percentiel per algoritme een binaire zoekactie
+    sorted_scores = np.sort(scores)
+    
     # Voeg verticale lijnen toe voor elk algoritme
     for algo, mean in algorithm_means.items():
         # Bereken het percentiel van dit algoritme in de baseline verdeling
-        percentile = 100 * (1 - (sum(score <= mean for score in scores) / len(scores)))
+        rank = np.searchsorted(sorted_scores, mean, side='right')
+        percentile = 100 * (1 - (rank / len(sorted_scores)))
         percentile_text = f"{algo}: {mean:.2f} (p{percentile:.1f})"
         
         plt.axvline(mean, color=colors[color_idx], linestyle='-', 
@@ -1,4 +1,6 @@
 class Connection:
+    __slots__ = ('station1', 'station2', 'distance', 'used')
+
     def __init__(self, station1: str, station2: str, distance: int):
         """
         Initialiseer een Connection object.
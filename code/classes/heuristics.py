@@ -13,6 +13,34 @@ class RouteHeuristics:
         """
         self.rail_network = rail_network
         self.time_limit = time_limit
+
+        # Aantal ongebruikte verbindingen per station, bijgehouden via mark_used
+        self.unused_counts: Dict[str, int] = {}
+        self.reset_unused_counts()
+
+    def reset_unused_counts(self) -> None:
+        """
+        Tel per station opnieuw de ongebruikte verbindingen.
+        Roep dit aan nadat de verbindingen van het netwerk zijn gereset.
+        """
+        self.unused_counts = {
+            name: sum(1 for conn in station.connections.values() if not conn.used)
+            for name, station in self.rail_network.stations.items()
+        }
+
+    def mark_used(self, connection: Connection) -> None:
+        """
+        Markeer een verbinding als gebruikt en werk de tellingen van beide stations bij.
+        
+        Args:
+            connection: De verbinding die gebruikt wordt
+        """
+        if connection.used:
+            return
+
+        connection.used = True
+        self.unused_counts[connection.station1] -= 1
+        self.unused_counts[connection.station2] -= 1
         
     def calculate_connection_value(self, connection: Connection, current_station: str, 
                                  current_route_time: int) -> float:
@@ -31,14 +59,11 @@ class RouteHeuristics:
             # Nooit verbindingen hergebruiken
             return float('-inf')  
             
-        # Haal het bestemmingsstation op
-        dest_station = connection.get_other_station(current_station)
+        station1 = connection.station1
+        dest_station = connection.station2 if current_station == station1 else station1
         
-        # Tel ongebruikte verbindingen die bereikbaar zijn vanaf het bestemmingsstation
-        nearby_unused = sum(
-            1 for conn in self.rail_network.stations[dest_station].connections.values() 
-            if not conn.used
-        )
+        # Ongebruikte verbindingen die bereikbaar zijn vanaf het bestemmingsstation
+        nearby_unused = self.unused_counts[dest_station]
         
         # Zwaar bestraffen als routes ons zouden dwingen een nieuwe route te creëren
         time_penalty = 0
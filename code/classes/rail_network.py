@@ -1,11 +1,15 @@
 import csv
 import random
+from collections import deque
 from typing import Dict, List, Tuple, Set
 from .station import Station
 from .connection import Connection
 from .route import Route
 
 class RailNetwork:
+    __slots__ = ('stations', 'connections', 'routes', 'station_ids', 'station_names', 'adjacency',
+                 'indexed_connections', 'connections_used')
+
     def __init__(self):
         """
         Initialiseer een RailNetwork object.
@@ -19,6 +23,17 @@ class RailNetwork:
         # Opslag voor routes
         self.routes: List[Route] = []  
 
+        # Vaste integer ids per station en de buren per id (zie build_station_index)
+        self.station_ids: Dict[str, int] = {}
+        self.station_names: List[str] = []
+        self.adjacency: List[List[Tuple[int, float, Connection]]] = []
+
+        # Aantal verbindingen toen de index werd opgebouwd, zie ensure_station_index
+        self.indexed_connections = 0
+
+        # Aantal unieke gebruikte verbindingen, bijgehouden door de HillClimber
+        self.connections_used = 0
+
     def load_stations(self, filename: str):
         """
         Laad stations uit een CSV-bestand.
@@ -51,6 +66,55 @@ class RailNetwork:
                 self.stations[connection.station1].add_connection(connection)
                 self.stations[connection.station2].add_connection(connection)
 
+        self.build_station_index()
+
+    def build_station_index(self):
+        """
+        Ken elk station een vast integer id toe en bouw per id de lijst van buren op.
+
+        De ids volgen een BFS vanaf het station met de meeste verbindingen, zodat
+        stations die naast elkaar liggen in het netwerk ook opeenvolgende ids krijgen.
+        Zo kunnen zoekalgoritmes met lijsten werken in plaats van dictionaries op stationnaam.
+        """
+        self.station_ids = {}
+        self.station_names = []
+        self.indexed_connections = len(self.connections)
+
+        # Start elke component bij het station met de meeste verbindingen
+        roots = sorted(self.stations.values(), key=lambda station: -len(station.connections))
+        for root in roots:
+            if root.name in self.station_ids:
+                continue
+
+            self.station_ids[root.name] = len(self.station_names)
+            self.station_names.append(root.name)
+            queue = deque([root.name])
+
+            while queue:
+                station = self.stations[queue.popleft()]
+                for neighbor in station.connections:
+                    if neighbor not in self.station_ids:
+                        self.station_ids[neighbor] = len(self.station_names)
+                        self.station_names.append(neighbor)
+                        queue.append(neighbor)
+
+        # Per station id: (id van de buur, afstand, verbinding)
+        self.adjacency = [
+            [
+                (self.station_ids[neighbor], connection.distance, connection)
+                for neighbor, connection in self.stations[name].connections.items()
+            ]
+            for name in self.station_names
+        ]
+
+    def ensure_station_index(self):
+        """
+        Bouw de station-index opnieuw op als er sinds de vorige keer stations of verbindingen
+        zijn toegevoegd, bijvoorbeeld bij een netwerk dat handmatig is opgebouwd.
+        """
+        if len(self.station_ids) != len(self.stations) or self.indexed_connections != len(self.connections):
+            self.build_station_index()
+
     def get_used_connections(self) -> Set[Connection]:
         """
         Verkrijg de set van alle unieke verbindingen die in de routes worden gebruikt.
@@ -58,10 +122,8 @@ class RailNetwork:
         Return:
             Set[Connection]: Set van unieke verbindingen die worden gebruikt
         """
-        used_connections = set()
-        for route in self.routes:
-            used_connections.update(route.connections_used)
-        return used_connections
+        # Voeg alle sets in één aanroep samen in plaats van per route update aan te roepen
+        return set().union(*[route.connections_used for route in self.routes])
 
     def calculate_quality(self) -> float:
         """
@@ -97,36 +159,45 @@ class RailNetwork:
         for conn in used_conns:
             conn.used = True
 
-    def create_route(self, start_station: str) -> Route:
+    def create_route(self, start_station: str, time_limit: int = 120, rng=random) -> Route:
         """
         Maak een enkele route die begint bij het opgegeven station.
 
         Args:
             start_station (str): Naam van het startstation
+            time_limit (int): Maximale tijdsduur van de route in minuten
+            rng: Random generator om verbindingen mee te kiezen, standaard de random module
 
         Return:
             Route: Gecreëerd route-object
         """
-        route = Route()
-        current_station = start_station
+        self.ensure_station_index()
+        adjacency = self.adjacency
+        station_names = self.station_names
+        choice = rng.choice
+
+        route = Route(time_limit)
+        current_id = self.station_ids[start_station]
         route.stations = [start_station]
         
         while True:
-            station = self.stations[current_station]
+            # De buren per id staan in dezelfde volgorde als station.connections,
+            # en bevatten de bestemming en afstand al, zodat die niet opnieuw opgezocht hoeven te worden
+            total_time = route.total_time
             possible_connections = [
-                conn for dest, conn in station.connections.items()
-                if not conn.used and route.total_time + conn.distance <= 120
+                edge for edge in adjacency[current_id]
+                if not edge[2].used and total_time + edge[1] <= time_limit
             ]
             
             if not possible_connections:
                 break
                 
-            connection = random.choice(possible_connections)
+            dest_id, _, connection = choice(possible_connections)
             if not route.add_connection(connection):
                 break
                 
-            current_station = connection.get_other_station(current_station)
-            route.stations.append(current_station)
+            current_id = dest_id
+            route.stations.append(station_names[dest_id])
             
         return route
 
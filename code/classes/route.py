@@ -2,6 +2,8 @@ from typing import List, Set
 from .connection import Connection
 
 class Route:
+    __slots__ = ('stations', 'total_time', 'connections_used', 'time_limit')
+
     def __init__(self, time_limit: int = 180):  # Standaard naar de grootste tijdslimiet
         """
         Initialiseer een Route object.
@@ -31,11 +33,27 @@ class Route:
         if not self.stations:
             self.stations.extend([connection.station1, connection.station2])
         else:
-            self.stations.append(connection.get_other_station(self.stations[-1]))
+            # Zelfde als connection.get_other_station, maar zonder extra functieaanroep
+            station1 = connection.station1
+            self.stations.append(connection.station2 if self.stations[-1] == station1 else station1)
         self.connections_used.add(connection)
         connection.used = True
         return True
 
+    def copy(self) -> 'Route':
+        """
+        Maak een kopie van de route met eigen lijsten, de verbindingen zelf worden gedeeld.
+        
+        Retourneert:
+            Route: Een nieuwe Route met dezelfde stations, tijd en verbindingen
+        """
+        new_route = Route.__new__(Route)
+        new_route.stations = self.stations[:]
+        new_route.total_time = self.total_time
+        new_route.connections_used = set(self.connections_used)
+        new_route.time_limit = self.time_limit
+        return new_route
+
     def __str__(self) -> str:
         """
         String representatie van de Route.
@@ -132,18 +132,24 @@ class SolutionStatistics:
 
         # Maak een dictionary met coördinaten van elk station gekoppeld aan het station
         stations = pd.read_csv('data/StationsNationaal.csv', header=None, names=['station', 'y', 'x'], skiprows=1)
-        station_coordinate = {}
-        for index, row in stations.iterrows():
-            station = row['station']
-            y_coordinate = row['y']
-            x_coordinate = row['x']
-            station_coordinate[station] = {'y': y_coordinate, 'x': x_coordinate}
+        # De kolommen worden in één keer uitgelezen in plaats van rij voor rij met iterrows
+        station_coordinate = {
+            station: {'y': y_coordinate, 'x': x_coordinate}
+            for station, y_coordinate, x_coordinate in zip(
+                stations['station'].tolist(), stations['y'].tolist(), stations['x'].tolist()
+            )
+        }
+
+        # Alle stations die in een van de routes voorkomen
+        route_stations = set()
+        for route in self.routes:
+            route_stations.update(route.stations)
 
         # Creëer een kaart ingezoomd op Nederland
         m = folium.Map(location=[52.1326, 4.2913], zoom_start=7)
         for station, coordinate in station_coordinate.items():
             # Controleer of elk station in een van de routes zit, en plaats een marker
-            if any(station in route.stations for route in self.routes):
+            if station in route_stations:
                 folium.Marker(
                     location=[coordinate['y'], coordinate['x']],
                     popup=station,
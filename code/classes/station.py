@@ -1,4 +1,6 @@
 class Station:
+    __slots__ = ('name', 'x', 'y', 'connections')
+
     def __init__(self, name, x, y):
         """
         Initialiseer een Station object.
@@ -1,9 +1,14 @@
+import random
 import pytest
 from classes.route import Route
 from classes.rail_network import RailNetwork
+from classes.connection import Connection
+from classes.station import Station
 from algorithms.random_algorithm import RandomAlgorithm
 from algorithms.greedy import GreedyAlgorithm
 from algorithms.hill_climber import HillClimber
+from algorithms.parallel import run_algorithm
+from algorithms.dijkstra_heuristic import DijkstraHeuristicAlgorithm
 from constants import HOLLAND_CONFIG, NATIONAL_CONFIG
 
 @pytest.fixture
@@ -39,6 +44,54 @@ def test_random_algorithm_constraints(holland_network):
     for route in routes:
         assert route.total_time <= HOLLAND_CONFIG['time_limit']
 
+def test_random_algorithm_used_count(national_network):
+    """Test that the used connection count matches the connections marked as used"""
+    algorithm = RandomAlgorithm(
+        national_network,
+        time_limit=NATIONAL_CONFIG['time_limit'],
+        max_routes=NATIONAL_CONFIG['max_routes']
+    )
+
+    for _ in range(20):
+        algorithm.create_solution()
+        assert algorithm.used_count == sum(1 for conn in national_network.connections if conn.used)
+
+def test_random_algorithm_multi_start():
+    """Test that multi start returns the best of the separate random runs"""
+    quality, routes = RandomAlgorithm.multi_start(
+        HOLLAND_CONFIG['stations_file'],
+        HOLLAND_CONFIG['connections_file'],
+        time_limit=HOLLAND_CONFIG['time_limit'],
+        max_routes=HOLLAND_CONFIG['max_routes'],
+        iterations=21,
+        workers=2
+    )
+
+    qualities = [
+        run_algorithm(
+            RandomAlgorithm,
+            HOLLAND_CONFIG['stations_file'],
+            HOLLAND_CONFIG['connections_file'],
+            chunk,
+            {
+                'time_limit': HOLLAND_CONFIG['time_limit'],
+                'max_routes': HOLLAND_CONFIG['max_routes'],
+                'rng': random.Random(seed)
+            }
+        )[0]
+        for seed, chunk in ((42, 11), (43, 10))
+    ]
+    assert quality == max(qualities)
+    assert len(routes) <= HOLLAND_CONFIG['max_routes']
+
+def test_random_algorithm_multi_start_without_iterations():
+    """Test that multi start without iterations returns the same as find_best_solution(0)"""
+    assert RandomAlgorithm.multi_start(
+        HOLLAND_CONFIG['stations_file'],
+        HOLLAND_CONFIG['connections_file'],
+        iterations=0
+    ) == (float('-inf'), [])
+
 def test_greedy_algorithm_solution(holland_network):
     """Test that greedy algorithm produces valid solution"""
     algorithm = GreedyAlgorithm(
@@ -57,6 +110,82 @@ def test_greedy_algorithm_solution(holland_network):
     for route in routes:
         assert len(route.connections_used) > 0
 
+def test_greedy_algorithm_connection_added_between_runs():
+    """Test that greedy uses a connection added between existing stations after the first run"""
+    network = RailNetwork()
+    for name in 'ABCD':
+        network.stations[name] = Station(name, 0, 0)
+
+    def connect(station1, station2):
+        connection = Connection(station1, station2, 10)
+        network.connections.append(connection)
+        network.stations[station1].add_connection(connection)
+        network.stations[station2].add_connection(connection)
+
+    connect('A', 'B')
+    connect('B', 'C')
+    algorithm = GreedyAlgorithm(network, time_limit=120, max_routes=1)
+    algorithm.find_best_solution()
+
+    connect('C', 'D')
+    quality, routes = algorithm.find_best_solution()
+
+    assert [route.stations for route in routes] == [['A', 'B', 'C', 'D']]
+    assert quality == network.calculate_quality()
+
+def test_dijkstra_heuristic_solution(national_network):
+    """Test that dijkstra heuristic produces valid, connected routes"""
+    algorithm = DijkstraHeuristicAlgorithm(
+        national_network,
+        time_limit=NATIONAL_CONFIG['time_limit'],
+        max_routes=NATIONAL_CONFIG['max_routes']
+    )
+
+    quality, routes = algorithm.find_best_solution()
+
+    assert 0 < len(routes) <= NATIONAL_CONFIG['max_routes']
+    assert quality == national_network.calculate_quality()
+
+    for route in routes:
+        assert route.total_time <= NATIONAL_CONFIG['time_limit']
+
+        # Every pair of consecutive stations must be joined by a connection of the route
+        for station1, station2 in zip(route.stations, route.stations[1:]):
+            assert national_network.stations[station1].connections[station2] in route.connections_used
+
+def test_dijkstra_heuristic_without_single_connection_stations():
+    """Test that a start station is found when no station has exactly one connection"""
+    network = RailNetwork()
+    for name in ["A", "B", "C"]:
+        network.stations[name] = Station(name, 0, 0)
+
+    # A triangle: every station has two connections
+    for station1, station2, distance in [("A", "B", 10), ("B", "C", 20), ("C", "A", 30)]:
+        connection = Connection(station1, station2, distance)
+        network.connections.append(connection)
+        network.stations[station1].add_connection(connection)
+        network.stations[station2].add_connection(connection)
+
+    algorithm = DijkstraHeuristicAlgorithm(network, time_limit=120, max_routes=7)
+    algorithm.count_unvisited_connections()
+    assert algorithm.calculate_start_station() == "A"
+
+    quality, routes = algorithm.find_best_solution()
+    assert len(routes) > 0
+    assert network.get_used_connections() == set(network.connections)
+
+def test_dijkstra_heuristic_find_route_standalone(holland_network):
+    """Test that find_route works without find_best_solution setting up its counts"""
+    algorithm = DijkstraHeuristicAlgorithm(holland_network, time_limit=120, max_routes=7)
+    visited_connections = set(holland_network.connections[:5])
+
+    route = algorithm.find_route("Leiden Centraal", visited_connections)
+
+    assert route.connections_used
+    assert not route.connections_used & visited_connections
+    assert route.stations[0] == "Leiden Centraal"
+    assert route.total_time <= 120
+
 def test_hill_climber_improvement(holland_network):
     """Test that hill climber improves on initial solution"""
     # Create a simple initial solution
@@ -88,6 +217,117 @@ def test_hill_climber_improvement(holland_network):
     
     final_quality, final_routes = hill_climber.find_best_solution(iterations=10)
 
+def test_hill_climber_connection_counts(holland_network):
+    """Test that the incremental connection counts match a full recount"""
+    hill_climber = HillClimber(
+        holland_network,
+        time_limit=HOLLAND_CONFIG['time_limit'],
+        max_routes=HOLLAND_CONFIG['max_routes']
+    )
+    hill_climber.find_best_solution(iterations=200)
+
+    incremental_counts = dict(hill_climber.used_connection_counts)
+    hill_climber.update_connection_count()
+    assert incremental_counts == dict(hill_climber.used_connection_counts)
+    assert holland_network.connections_used == len(incremental_counts)
+
+def test_hill_climber_simulated_annealing(holland_network):
+    """Test that simulated annealing returns its best solution"""
+    hill_climber = HillClimber(
+        holland_network,
+        time_limit=HOLLAND_CONFIG['time_limit'],
+        max_routes=HOLLAND_CONFIG['max_routes']
+    )
+    initial_quality = holland_network.calculate_quality()
+
+    quality, routes = hill_climber.find_best_solution(iterations=200, simulated_annealing=True)
+
+    assert quality >= initial_quality
+    holland_network.routes = routes
+    assert holland_network.calculate_quality() == pytest.approx(quality)
+
+def test_hill_climber_simulated_annealing_cooled_down(holland_network):
+    """Test that annealing keeps running once the temperature has underflowed to 0"""
+    hill_climber = HillClimber(
+        holland_network,
+        time_limit=HOLLAND_CONFIG['time_limit'],
+        max_routes=HOLLAND_CONFIG['max_routes']
+    )
+
+    quality, routes = hill_climber.find_best_solution(iterations=2000, simulated_annealing=True, cooling=0.5)
+
+    holland_network.routes = routes
+    assert holland_network.calculate_quality() == pytest.approx(quality)
+
+    with pytest.raises(ValueError):
+        hill_climber.find_best_solution(iterations=10, simulated_annealing=True, start_temperature=0.0)
+    with pytest.raises(ValueError):
+        hill_climber.find_best_solution(iterations=10, simulated_annealing=True, cooling=1.5)
+
+def test_hill_climber_multi_start():
+    """Test that multi start returns the best of the separate hill climbers"""
+    quality, routes = HillClimber.multi_start(
+        HOLLAND_CONFIG['stations_file'],
+        HOLLAND_CONFIG['connections_file'],
+        time_limit=HOLLAND_CONFIG['time_limit'],
+        max_routes=HOLLAND_CONFIG['max_routes'],
+        iterations=50,
+        starts=2,
+        workers=2
+    )
+
+    qualities = [
+        run_algorithm(
+            HillClimber,
+            HOLLAND_CONFIG['stations_file'],
+            HOLLAND_CONFIG['connections_file'],
+            50,
+            {'time_limit': HOLLAND_CONFIG['time_limit'], 'max_routes': HOLLAND_CONFIG['max_routes'], 'seed': seed}
+        )[0]
+        for seed in (42, 43)
+    ]
+    assert quality == max(qualities)
+    assert len(routes) <= HOLLAND_CONFIG['max_routes']
+
+def test_hill_climber_cache(tmp_path):
+    """Test that a cached hill climber run returns the same solution"""
+    results = []
+    for _ in range(2):
+        network = RailNetwork()
+        network.load_stations(HOLLAND_CONFIG['stations_file'])
+        network.load_connections(HOLLAND_CONFIG['connections_file'])
+        hill_climber = HillClimber(
+            network,
+            time_limit=HOLLAND_CONFIG['time_limit'],
+            max_routes=HOLLAND_CONFIG['max_routes']
+        )
+        results.append(hill_climber.find_best_solution(iterations=100, use_cache=True, cache_dir=str(tmp_path)))
+
+    assert len(list(tmp_path.iterdir())) == 1
+    (quality, routes), (cached_quality, cached_routes) = results
+    assert cached_quality == quality
+    assert [route.stations for route in cached_routes] == [route.stations for route in routes]
+    network.routes = cached_routes
+    assert network.calculate_quality() == pytest.approx(quality)
+
+def test_hill_climber_cache_key_used_connections(tmp_path):
+    """Test that connections marked as used outside the routes change the cache key"""
+    paths = []
+    for mark_unused in (False, True):
+        network = RailNetwork()
+        network.load_stations(HOLLAND_CONFIG['stations_file'])
+        network.load_connections(HOLLAND_CONFIG['connections_file'])
+        hill_climber = HillClimber(
+            network,
+            time_limit=HOLLAND_CONFIG['time_limit'],
+            max_routes=HOLLAND_CONFIG['max_routes']
+        )
+        if mark_unused:
+            next(conn for conn in network.connections if not conn.used).used = True
+        paths.append(hill_climber.cache_path(str(tmp_path), 100))
+
+    assert paths[0] != paths[1]
+
 def test_solution_validity(holland_network):
     """Test validity of solutions from different algorithms"""
     algorithms = [
@@ -132,4 +372,4 @@ def test_cross_algorithm_comparison(holland_network):
     
     # Ensure all algorithms produce valid solutions
     assert all(isinstance(q, (int, float)) for q in results)
-    assert all(q > -10000 for q in results)  # Basic sanity check on quality scores
\ No newline at end of file
+    assert all(q > -10000 for q in results)  # Basic sanity check on quality scores
@@ -3,6 +3,7 @@ from classes.rail_network import RailNetwork
 from classes.route import Route
 from classes.connection import Connection
 from classes.station import Station
+from classes.heuristics import RouteHeuristics
 from constants import HOLLAND_CONFIG
 
 @pytest.fixture
@@ -96,4 +97,45 @@ def test_network_constraints():
     
     # Verify route time constraints
     for route in network.routes:
-        assert route.total_time <= HOLLAND_CONFIG['time_limit']
\ No newline at end of file
+        assert route.total_time <= HOLLAND_CONFIG['time_limit']
+
+def test_station_index(sample_network):
+    """Test that every station gets a unique id and the adjacency matches the connections"""
+    ids = sample_network.station_ids
+    assert sorted(ids.values()) == list(range(len(sample_network.stations)))
+    assert [sample_network.station_names[i] for i in range(len(ids))] == sorted(ids, key=ids.get)
+
+    # The most connected station is the root of the BFS numbering
+    most_connected = max(sample_network.stations.values(), key=lambda s: len(s.connections))
+    assert len(sample_network.stations[sample_network.station_names[0]].connections) == len(most_connected.connections)
+
+    for name, station in sample_network.stations.items():
+        neighbors = sample_network.adjacency[ids[name]]
+        assert len(neighbors) == len(station.connections)
+        for neighbor_id, distance, connection in neighbors:
+            assert station.connections[sample_network.station_names[neighbor_id]] is connection
+            assert distance == connection.distance
+
+def test_station_index_rebuilt_after_new_connection(sample_network):
+    """Test that a connection added after the index was built ends up in the adjacency"""
+    sample_network.ensure_station_index()
+    station1, station2 = sorted(sample_network.stations)[:2]
+    connection = Connection(station1, station2, 5)
+    sample_network.connections.append(connection)
+    sample_network.stations[station1].add_connection(connection)
+    sample_network.stations[station2].add_connection(connection)
+
+    sample_network.ensure_station_index()
+    ids = sample_network.station_ids
+    assert any(conn is connection for _, _, conn in sample_network.adjacency[ids[station1]])
+
+def test_heuristic_unused_counts(sample_network):
+    """Test that the cached unused counts follow connections being marked as used"""
+    heuristic = RouteHeuristics(sample_network)
+    connection = sample_network.connections[0]
+    heuristic.mark_used(connection)
+    heuristic.mark_used(connection)
+
+    for name, station in sample_network.stations.items():
+        expected = sum(1 for conn in station.connections.values() if not conn.used)
+        assert heuristic.unused_counts[name] == expected
@@ -50,4 +50,17 @@ def test_connection_marking_as_used(sample_route, sample_connection):
     """Test that connections are marked as used when added"""
     assert not sample_connection.used
     sample_route.add_connection(sample_connection)
-    assert sample_connection.used
\ No newline at end of file
+    assert sample_connection.used
+
+def test_route_copy(sample_route, sample_connection):
+    """Test that a copied route does not share its lists with the original"""
+    sample_route.add_connection(sample_connection)
+    copied = sample_route.copy()
+
+    copied.add_connection(Connection("Rotterdam", "Den Haag", 20))
+
+    assert sample_route.stations == ["Amsterdam", "Rotterdam"]
+    assert sample_route.total_time == 40
+    assert len(sample_route.connections_used) == 1
+    assert copied.stations == ["Amsterdam", "Rotterdam", "Den Haag"]
+    assert sample_connection in copied.connections_used